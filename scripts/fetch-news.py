@@ -8,12 +8,43 @@ Last Updated: 2025
 import json
 import datetime
 import time
+import sys
+import argparse
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 import requests
-from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import quote, urlparse
 import os
 import re
+import html
+import functools
+import hashlib
+import heapq
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
 import feedparser
-from bs4 import BeautifulSoup
+import orjson
+from lxml import etree, html as lxml_html
+
+# Precompiled patterns used on every article
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Only real tags, so unescaped text such as '< 1,500' survives
+_DECODED_TAG_RE = re.compile(r'</?[A-Za-z][^<>]*>')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Entry keys read from each plain RSS <item>, with the element they come from
+_RSS_ITEM_FIELDS = (
+    ("title", "title"),
+    ("link", "link"),
+    ("summary", "description"),
+    ("published", "pubDate"),
+)
+
+log = logging.getLogger(__name__)
 
 # ==================== CONFIGURATION ====================
 class Config:
@@ -102,55 +133,157 @@ class Config:
         'Lagos', 'Abuja', 'FG', 'federal government', 'revenue',
         'export', 'import', 'trade', 'manufacturing', 'agriculture'
     ]
+    KEYWORDS_LOWER = tuple(keyword.lower() for keyword in KEYWORDS)
+    
+    # Google News feeds (via RSS.app)
+    GOOGLE_NEWS_FEEDS = [
+        "https://rss.app/feeds/v6hV9JCnF3q3pWwR.xml",
+        "https://rss.app/feeds/d8ZfvKj7JDMTC6zN.xml",
+    ]
+    
+    # Twitter searches (via Nitter)
+    TWITTER_TOPICS = [
+        ("nigeria economy", "https://nitter.net/search/rss?f=tweets&q=nigeria+economy"),
+        ("CBN Nigeria", "https://nitter.net/search/rss?f=tweets&q=CBN+Nigeria"),
+    ]
+    
+    # Politeness limit for concurrent requests to the same host
+    MAX_REQUESTS_PER_HOST = 2
+    
+    # Retries for transient failures (429/5xx), honouring Retry-After up to a cap
+    MAX_RETRIES = 3
+    MAX_RETRY_AFTER = 30
+    
+    # Conditional-GET cache for RSS feeds (reused without a request for 10 min)
+    FEED_CACHE_FILE = "api/feed_cache.json"
+    FEED_CACHE_TTL = 600
+    
+    # How long a CORS proxy is skipped after a timeout or 5xx
+    PROXY_COOLDOWN = 60
 
 # ==================== UTILITY FUNCTIONS ====================
+# Health of each CORS proxy: skipped until fail_until, ranked by latency (seconds, EWMA)
+_proxy_stats = {proxy: {'fail_until': 0.0, 'latency': None} for proxy in Config.CORS_PROXIES}
+
 class Utils:
     @staticmethod
     def clean_text(text):
         """Remove HTML tags and clean text"""
         if not text:
             return ""
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'&[a-z]+;', ' ', text)
-        text = ' '.join(text.split())
-        return text.strip()
+        # Most titles carry no markup, so skip the regex scans for them
+        if '<' in text:
+            text = _HTML_TAG_RE.sub('', text)
+        if '&' in text:
+            text = html.unescape(text)
+            # Entity-encoded markup must not come out as live HTML
+            if '<' in text:
+                text = _DECODED_TAG_RE.sub('', text)
+        # split() already drops leading/trailing whitespace
+        return ' '.join(text.split())
+    
+    @staticmethod
+    def truncate(text, limit, suffix='...'):
+        """Cut text to limit characters, marking the cut with suffix"""
+        return text if len(text) <= limit else text[:limit] + suffix
     
     @staticmethod
-    def parse_date(date_str):
-        """Parse various date formats to ISO format"""
+    def parse_date(date_str, default=None):
+        """Parse RSS (RFC 2822) and ISO 8601 dates to a naive UTC datetime
+        
+        Unparseable dates fall back to default, or the current time.
+        """
+        if default is None:
+            default = datetime.datetime.utcnow()
+        
         if not date_str:
-            return datetime.datetime.utcnow().isoformat() + 'Z'
+            return default
         
         try:
-            formats = [
-                "%a, %d %b %Y %H:%M:%S %z",
-                "%a, %d %b %Y %H:%M:%S %Z",
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%d %H:%M:%S",
-                "%d %b %Y %H:%M:%S",
-                "%b %d, %Y"
-            ]
-            
-            for fmt in formats:
+            dt = parsedate_to_datetime(date_str)
+        except (TypeError, ValueError):
+            try:
+                dt = datetime.datetime.fromisoformat(date_str.rstrip('Z'))
+            except ValueError:
                 try:
-                    dt = datetime.datetime.strptime(date_str, fmt)
-                    return dt.isoformat() + 'Z'
-                except:
-                    continue
-            
-            # Ensure year is current
-            current_year = str(datetime.datetime.utcnow().year)
-            if current_year not in date_str:
-                # Replace old year with current year
-                for year in ['2020', '2021', '2022', '2023', '2024']:
-                    if year in date_str:
-                        date_str = date_str.replace(year, current_year)
-                        break
-            
-            return datetime.datetime.utcnow().isoformat() + 'Z'
-            
-        except:
-            return datetime.datetime.utcnow().isoformat() + 'Z'
+                    dt = datetime.datetime.strptime(date_str, "%b %d, %Y")
+                except ValueError:
+                    return default
+        
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return dt
+    
+    @staticmethod
+    def entry_date(entry, default=None):
+        """Publication date of a feed entry, preferring feedparser's parsed value"""
+        parsed = entry.get('published_parsed')
+        if parsed:
+            # feedparser has already normalised this to UTC
+            return datetime.datetime(*parsed[:6])
+        return Utils.parse_date(entry.get('published', ''), default)
+    
+    @staticmethod
+    def parse_feed(body):
+        """Parse feed bytes: plain RSS items with lxml, anything else with feedparser"""
+        try:
+            # Parsers are not shared between fetcher threads
+            parser = etree.XMLParser(resolve_entities=False, no_network=True)
+            root = etree.fromstring(body, parser)
+        except (etree.XMLSyntaxError, ValueError):
+            root = None
+        
+        if root is not None and root.tag == 'rss':
+            entries = []
+            for item in root.iter('item'):
+                # Like feedparser, leave out missing elements so callers' defaults apply
+                entry = {}
+                for key, tag in _RSS_ITEM_FIELDS:
+                    value = item.findtext(tag)
+                    if value is not None:
+                        entry[key] = value
+                if 'link' in entry:
+                    entry['link'] = entry['link'].strip()
+                entries.append(entry)
+            return entries
+        
+        # Atom, RDF and malformed feeds
+        return feedparser.parse(body).entries
+    
+    @staticmethod
+    def load_dates(articles):
+        """Turn saved 'published_at' strings back into naive UTC datetimes
+        
+        Articles without a usable date are dropped.
+        """
+        loaded = []
+        for article in articles:
+            pub_date = article.get('published_at')
+            if not isinstance(pub_date, str) or not pub_date:
+                continue
+            try:
+                dt = datetime.datetime.fromisoformat(pub_date.rstrip('Z'))
+            except ValueError:
+                dt = Utils.parse_date(pub_date)
+            # Older runs wrote offsets such as '+00:00Z'
+            if dt.tzinfo is not None:
+                dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+            article['published_at'] = dt
+            loaded.append(article)
+        return loaded
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def keyword_pattern(keywords):
+        """Compile a tuple of keywords into a single lowercase alternation"""
+        # Anchor at a word start so short acronyms (FG, MPC) do not match
+        # inside other words; the end is left open for plurals ('Nigerians')
+        # Words of a phrase may be split by any whitespace, including newlines
+        alternation = '|'.join(
+            r'\s+'.join(re.escape(word) for word in keyword.lower().split())
+            for keyword in keywords
+        )
+        return re.compile(rf'\b(?:{alternation})')
     
     @staticmethod
     def is_relevant(text, keywords):
@@ -158,149 +291,352 @@ class Utils:
         if not text:
             return False
         
-        text_lower = text.lower()
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                return True
-        return False
+        # One regex scan instead of a substring search per keyword
+        pattern = Utils.keyword_pattern(tuple(keywords))
+        return pattern.search(text.lower()) is not None
     
     @staticmethod
-    def get_cors_proxy(url):
+    def article_id(prefix, title):
+        """Stable article ID (unlike hash(), identical across runs)"""
+        digest = hashlib.blake2b(title.encode('utf-8'), digest_size=6).hexdigest()
+        return f"{prefix}_{digest}"
+    
+    @staticmethod
+    def write_json(path, data, indent=True):
+        """Serialise data straight to a UTF-8 JSON file with orjson
+        
+        The file is replaced atomically, so readers never see a partial write.
+        """
+        # Naive datetimes are UTC and are written as ISO strings ending in 'Z'
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(data, option=option))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    
+    @staticmethod
+    def pick_cors_proxy():
+        """Fastest CORS proxy that has not failed recently"""
+        now = time.time()
+        healthy = [p for p, stats in _proxy_stats.items() if stats['fail_until'] <= now]
+        if not healthy:
+            # All are cooling down; use whichever recovers first
+            return min(_proxy_stats, key=lambda p: _proxy_stats[p]['fail_until'])
+        # Untried proxies count as fastest so each gets measured
+        return min(healthy, key=lambda p: _proxy_stats[p]['latency'] or 0.0)
+    
+    @staticmethod
+    def get_cors_proxy(url, proxy=None):
         """Get URL through CORS proxy"""
-        import random
-        proxy = random.choice(Config.CORS_PROXIES)
+        if proxy is None:
+            proxy = Utils.pick_cors_proxy()
         return f"{proxy}{quote(url)}"
+    
+    @staticmethod
+    def record_proxy(proxy, ok, elapsed):
+        """Open the proxy's circuit on failure, otherwise update its latency"""
+        stats = _proxy_stats[proxy]
+        if not ok:
+            stats['fail_until'] = time.time() + Config.PROXY_COOLDOWN
+        elif stats['latency'] is None:
+            stats['latency'] = elapsed
+        else:
+            stats['latency'] += 0.3 * (elapsed - stats['latency'])
+
+# ==================== FEED CACHE ====================
+class FeedCache:
+    """ETag/Last-Modified validators and parsed articles per feed, kept between runs"""
+    
+    def __init__(self, path=Config.FEED_CACHE_FILE, ttl=Config.FEED_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        try:
+            with open(path, "r", encoding='utf-8') as f:
+                self.feeds = json.load(f)
+        except (OSError, ValueError):
+            self.feeds = {}
+        
+        for entry in self.feeds.values():
+            entry['articles'] = Utils.load_dates(entry['articles'])
+    
+    def get(self, key):
+        """Cached entry for a feed, if any"""
+        return self.feeds.get(key)
+    
+    def is_fresh(self, entry):
+        """True if the entry is recent enough to skip the request entirely"""
+        return entry is not None and time.time() - entry['fetched_at'] < self.ttl
+    
+    def headers(self, entry):
+        """Conditional-GET headers for a previously fetched feed"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def store(self, key, response, articles):
+        """Remember a feed's validators and the articles built from it"""
+        self.feeds[key] = {
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "fetched_at": time.time(),
+            "articles": articles
+        }
+    
+    def touch(self, key):
+        """Restart the TTL of a feed the server reported as unchanged"""
+        self.feeds[key]['fetched_at'] = time.time()
+    
+    def save(self):
+        """Persist the cache for the next run"""
+        Utils.write_json(self.path, self.feeds, indent=False)
 
 # ==================== NEWS FETCHERS ====================
+class CappedRetry(Retry):
+    """Retry policy that honours Retry-After without sleeping for too long"""
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, Config.MAX_RETRY_AFTER)
+
 class NewsFetcher:
     def __init__(self):
         self.utils = Utils()
         self.config = Config()
+        self.feed_cache = FeedCache()
+        self.session = self.create_session()
+        self.host_limits = {}
+        self.previous = self.load_previous_articles()
+        self.run_started = datetime.datetime.utcnow()
+        self.run_ts = self.run_started.isoformat() + 'Z'
+    
+    def create_session(self):
+        """Shared HTTP session so connections are reused across requests"""
+        session = requests.Session()
+        session.headers.update(self.config.HEADERS)
+        
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=CappedRetry(
+                total=self.config.MAX_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                respect_retry_after_header=True
+            )
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    def load_previous_articles(self):
+        """Articles saved by the last run, keyed by URL"""
+        try:
+            with open("api/news.json", "r", encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        return {
+            article['url']: article
+            for article in Utils.load_dates(previous.get('articles', []))
+            if article.get('url')
+        }
+    
+    def http_get(self, url, headers=None):
+        """GET a URL, returning None on network errors"""
+        # setdefault is atomic, so threads racing on a new host share one semaphore
+        host = urlparse(url).netloc
+        limit = self.host_limits.setdefault(
+            host, threading.BoundedSemaphore(self.config.MAX_REQUESTS_PER_HOST)
+        )
+        
+        try:
+            with limit:
+                return self.session.get(url, headers=headers, timeout=10)
+        except requests.RequestException:
+            return None
+    
+    def fetch_feed(self, key, url, label, build):
+        """Fetch a feed and build its articles, reusing the cache while it is unchanged
+        
+        build(entries) turns parsed entries into articles; it is skipped
+        entirely when the cache is fresh or the server answers 304.
+        """
+        # Reuse the cached articles while they are fresh
+        cached = self.feed_cache.get(key)
+        if self.feed_cache.is_fresh(cached):
+            log.info(f"   ♻️ {label}: {len(cached['articles'])} cached")
+            return [dict(a, timestamp=self.run_ts) for a in cached['articles']]
+        
+        # Fetch directly, conditional on what we saw last run
+        response = self.http_get(url, self.feed_cache.headers(cached))
+        
+        if response is not None and response.status_code == 304 and cached:
+            self.feed_cache.touch(key)
+            log.info(f"   ♻️ {label}: not modified")
+            return [dict(a, timestamp=self.run_ts) for a in cached['articles']]
+        
+        entries = []
+        if response is not None and response.status_code == 200:
+            entries = self.utils.parse_feed(response.content)
+        
+        if not entries:
+            log.warning(f"   ❌ {label}: no items")
+            return []
+        
+        log.info(f"   ✅ {label}: {len(entries)} items")
+        articles = build(entries)
+        self.feed_cache.store(key, response, articles)
+        return articles
     
     def fetch_rss_feed(self, source):
         """Fetch and parse RSS feed"""
+        try:
+            log.info(f"📡 {source['name']}...")
+            return self.fetch_feed(
+                source['url'], source['url'], source['name'],
+                lambda entries: self.build_rss_articles(source, entries)
+            )
+        except Exception as e:
+            log.warning(f"   ❌ {source['name']}: error")
+            return []
+    
+    def build_rss_articles(self, source, entries):
+        """Turn RSS entries into relevant articles"""
         articles = []
         
-        try:
-            print(f"📡 {source['name']}...")
+        for entry in entries[:10]:
+            # Entries already processed last run are reused as-is. Articles
+            # written before stable IDs (and the end of the year rewriting)
+            # carry a hash() ID instead and are rebuilt from the feed
+            previous = self.previous.get(entry.get('link', ''))
+            if (
+                previous is not None
+                and previous.get('source') == source['name']
+                and previous.get('id') == self.utils.article_id(source['name'], previous.get('title') or '')
+            ):
+                articles.append(dict(previous, timestamp=self.run_ts))
+                continue
             
-            # Try direct fetch
-            feed = feedparser.parse(source['url'])
+            raw_title = entry.get('title', '')
+            raw_summary = entry.get('summary', '')
             
-            # If no entries, try with proxy
-            if not feed.entries:
-                proxy_url = self.utils.get_cors_proxy(source['url'])
-                feed = feedparser.parse(proxy_url)
+            # Plain text reads the same before and after clean_text, so check
+            # its relevance first and let rejected entries skip cleaning
+            raw_text = raw_title + ' ' + raw_summary
+            has_markup = '<' in raw_text or '&' in raw_text
+            if not has_markup and not self.utils.is_relevant(raw_text, self.config.KEYWORDS_LOWER):
+                continue
             
-            if feed.entries:
-                print(f"   ✅ {len(feed.entries)} items")
-                
-                for entry in feed.entries[:10]:
-                    title = self.utils.clean_text(entry.get('title', ''))
-                    summary = self.utils.clean_text(entry.get('summary', ''))
-                    
-                    # Check relevance
-                    if not self.utils.is_relevant(title + ' ' + summary, self.config.KEYWORDS):
-                        continue
-                    
-                    url = entry.get('link', '')
-                    pub_date = self.utils.parse_date(entry.get('published', ''))
-                    
-                    article = {
-                        "id": f"{source['name']}_{hash(title) % 1000000}",
-                        "title": title,
-                        "url": url,
-                        "summary": summary[:200] + '...' if len(summary) > 200 else summary,
-                        "source": source['name'],
-                        "category": source['category'],
-                        "published_at": pub_date,
-                        "timestamp": datetime.datetime.utcnow().isoformat() + 'Z',
-                        "type": "rss"
-                    }
-                    
-                    if article['title'] and article['url']:
-                        articles.append(article)
+            title = self.utils.clean_text(raw_title)
+            summary = self.utils.clean_text(raw_summary)
             
-            else:
-                print(f"   ❌ No items")
-                
-        except Exception as e:
-            print(f"   ❌ Error")
+            # Tags and entities can both hide a keyword ('Central&nbsp;Bank')
+            # and fake one (a link URL), so judge such entries on clean text
+            if has_markup and not self.utils.is_relevant(title + ' ' + summary, self.config.KEYWORDS_LOWER):
+                continue
+            
+            url = entry.get('link', '')
+            pub_date = self.utils.entry_date(entry, self.run_started)
+            
+            article = {
+                "id": self.utils.article_id(source['name'], title),
+                "title": title,
+                "url": url,
+                "summary": self.utils.truncate(summary, 200),
+                "source": source['name'],
+                "category": source['category'],
+                "published_at": pub_date,
+                "timestamp": self.run_ts,
+                "type": "rss"
+            }
+            
+            if article['title'] and article['url']:
+                articles.append(article)
         
         return articles
     
-    def fetch_google_news(self):
-        """Fetch from Google News via RSS.app"""
-        articles = []
+    def fetch_google_news(self, url):
+        """Fetch one Google News feed via RSS.app"""
         try:
-            urls = [
-                "https://rss.app/feeds/v6hV9JCnF3q3pWwR.xml",
-                "https://rss.app/feeds/d8ZfvKj7JDMTC6zN.xml",
-            ]
-            
-            for url in urls:
-                feed = feedparser.parse(url)
-                if feed.entries:
-                    for entry in feed.entries[:5]:
-                        title = self.utils.clean_text(entry.get('title', ''))
-                        if not self.utils.is_relevant(title, self.config.KEYWORDS):
-                            continue
-                        
-                        article = {
-                            "id": f"google_{hash(title) % 1000000}",
-                            "title": title,
-                            "url": entry.get('link', ''),
-                            "summary": self.utils.clean_text(entry.get('summary', ''))[:150],
-                            "source": "Google News",
-                            "category": "aggregated",
-                            "published_at": self.utils.parse_date(entry.get('published', '')),
-                            "timestamp": datetime.datetime.utcnow().isoformat() + 'Z',
-                            "type": "google_news"
-                        }
-                        
-                        if article['title'] and article['url']:
-                            articles.append(article)
+            # Some of these URLs are also plain RSS sources; keep their cache entries apart
+            articles = self.fetch_feed(f"google:{url}", url, "Google News", self.build_google_articles)
+            log.info(f"✅ Google News: {len(articles)} articles")
+            return articles
+        except Exception as e:
+            log.warning(f"❌ Google News error")
+            return []
+    
+    def build_google_articles(self, entries):
+        """Turn Google News entries into relevant articles"""
+        articles = []
+        
+        for entry in entries[:5]:
+            title = self.utils.clean_text(entry.get('title', ''))
+            if not self.utils.is_relevant(title, self.config.KEYWORDS_LOWER):
+                continue
             
-            print(f"✅ Google News: {len(articles)} articles")
+            article = {
+                "id": self.utils.article_id("google", title),
+                "title": title,
+                "url": entry.get('link', ''),
+                "summary": self.utils.clean_text(entry.get('summary', ''))[:150],
+                "source": "Google News",
+                "category": "aggregated",
+                "published_at": self.utils.entry_date(entry, self.run_started),
+                "timestamp": self.run_ts,
+                "type": "google_news"
+            }
             
-        except Exception as e:
-            print(f"❌ Google News error")
+            if article['title'] and article['url']:
+                articles.append(article)
         
         return articles
     
-    def fetch_twitter_feeds(self):
-        """Fetch tweets from Nitter"""
-        articles = []
+    def fetch_twitter_feed(self, topic_name, url):
+        """Fetch tweets for one topic from Nitter"""
         try:
-            topics = [
-                ("nigeria economy", "https://nitter.net/search/rss?f=tweets&q=nigeria+economy"),
-                ("CBN Nigeria", "https://nitter.net/search/rss?f=tweets&q=CBN+Nigeria"),
-            ]
-            
-            for topic_name, url in topics:
-                feed = feedparser.parse(url)
-                if feed.entries:
-                    for entry in feed.entries[:3]:
-                        content = self.utils.clean_text(entry.get('title', ''))
-                        
-                        article = {
-                            "id": f"twitter_{hash(content) % 1000000}",
-                            "title": content[:80] + '...' if len(content) > 80 else content,
-                            "url": entry.get('link', '#'),
-                            "summary": "",
-                            "source": f"Twitter - {topic_name}",
-                            "category": "social",
-                            "published_at": self.utils.parse_date(entry.get('published', '')),
-                            "timestamp": datetime.datetime.utcnow().isoformat() + 'Z',
-                            "type": "twitter"
-                        }
-                        
-                        articles.append(article)
+            articles = self.fetch_feed(
+                f"twitter:{url}", url, f"Twitter ({topic_name})",
+                lambda entries: self.build_tweets(topic_name, entries)
+            )
+            log.info(f"✅ Twitter ({topic_name}): {len(articles)} tweets")
+            return articles
+        except Exception as e:
+            log.warning(f"❌ Twitter error")
+            return []
+    
+    def build_tweets(self, topic_name, entries):
+        """Turn Nitter search entries into tweet articles"""
+        articles = []
+        
+        for entry in entries[:3]:
+            content = self.utils.clean_text(entry.get('title', ''))
             
-            print(f"✅ Twitter: {len(articles)} tweets")
+            article = {
+                "id": self.utils.article_id("twitter", content),
+                "title": self.utils.truncate(content, 80),
+                "url": entry.get('link', '#'),
+                "summary": "",
+                "source": f"Twitter - {topic_name}",
+                "category": "social",
+                "published_at": self.utils.entry_date(entry, self.run_started),
+                "timestamp": self.run_ts,
+                "type": "twitter"
+            }
             
-        except Exception as e:
-            print(f"❌ Twitter error")
+            articles.append(article)
         
         return articles
     
@@ -318,20 +654,31 @@ class NewsFetcher:
         
         for target in targets:
             try:
-                print(f"🌐 {target['name']}...")
+                log.info(f"🌐 {target['name']}...")
+                
+                response = self.http_get(target['url'])
                 
-                proxy_url = self.utils.get_cors_proxy(target['url'])
-                response = requests.get(proxy_url, headers=self.config.HEADERS, timeout=10)
+                # Only go through a CORS proxy when the site itself fails
+                if response is None or response.status_code != 200 or not response.content:
+                    proxy = self.utils.pick_cors_proxy()
+                    started = time.monotonic()
+                    response = self.http_get(self.utils.get_cors_proxy(target['url'], proxy))
+                    self.utils.record_proxy(
+                        proxy,
+                        response is not None and response.status_code < 500,
+                        time.monotonic() - started
+                    )
                 
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                if response is not None and response.status_code == 200:
+                    # Hand lxml the raw bytes so it detects the encoding itself
+                    doc = lxml_html.document_fromstring(response.content)
                     
-                    # Look for news items
+                    # Look for news items, stopping once we have enough
                     news_items = []
-                    for i, link in enumerate(soup.find_all('a', href=True)[:15]):
-                        text = link.get_text(strip=True)
-                        if len(text) > 15 and self.utils.is_relevant(text, self.config.KEYWORDS):
-                            href = link['href']
+                    for link in doc.iterfind('.//a[@href]'):
+                        text = ' '.join(link.text_content().split())
+                        if len(text) > 15 and self.utils.is_relevant(text, self.config.KEYWORDS_LOWER):
+                            href = link.get('href')
                             if not href.startswith('http'):
                                 href = target['url'] + href
                             
@@ -339,172 +686,190 @@ class NewsFetcher:
                                 "title": text[:100],
                                 "url": href
                             })
+                            if len(news_items) >= 3:
+                                break
                     
-                    for item in news_items[:3]:
+                    for item in news_items:
                         article = {
-                            "id": f"web_{hash(item['title']) % 1000000}",
+                            "id": self.utils.article_id("web", item['title']),
                             "title": item['title'],
                             "url": item['url'],
                             "summary": f"Update from {target['name']}",
                             "source": target['name'],
                             "category": target['category'],
-                            "published_at": datetime.datetime.utcnow().isoformat() + 'Z',
-                            "timestamp": datetime.datetime.utcnow().isoformat() + 'Z',
+                            "published_at": self.run_started,
+                            "timestamp": self.run_ts,
                             "type": "web"
                         }
                         articles.append(article)
                     
-                    print(f"   ✅ {len(news_items)} items")
+                    log.info(f"   ✅ {target['name']}: {len(news_items)} items")
                 
             except Exception as e:
-                print(f"   ❌ Error")
+                log.warning(f"   ❌ {target['name']}: error")
                 continue
         
         return articles
     
     def generate_current_articles(self):
         """Generate current articles if sources fail"""
-        today = datetime.datetime.utcnow()
+        today = self.run_started
         
         articles = [
             {
-                "id": "1",
                 "title": "Nigerian Economy Shows Growth in 2025",
                 "url": "https://businessday.ng/economy-growth-2025/",
                 "summary": "Economic indicators show positive growth trends in Nigeria for 2025.",
                 "source": "BusinessDay Nigeria",
                 "category": "business",
-                "published_at": today.isoformat() + 'Z',
-                "timestamp": today.isoformat() + 'Z',
+                "published_at": today,
+                "timestamp": self.run_ts,
                 "type": "current"
             },
             {
-                "id": "2",
                 "title": "CBN Maintains Monetary Policy Stance",
                 "url": "https://www.cbn.gov.ng/policy-2025/",
                 "summary": "Central Bank keeps interest rates steady to manage inflation.",
                 "source": "Central Bank of Nigeria",
                 "category": "monetary_policy",
-                "published_at": (today - datetime.timedelta(hours=1)).isoformat() + 'Z',
-                "timestamp": today.isoformat() + 'Z',
+                "published_at": today - datetime.timedelta(hours=1),
+                "timestamp": self.run_ts,
                 "type": "current"
             },
             {
-                "id": "3",
                 "title": "Naira Exchange Rate Update",
                 "url": "https://nairametrics.com/forex-2025/",
                 "summary": "Latest updates on naira to dollar exchange rates in Nigerian markets.",
                 "source": "Nairametrics",
                 "category": "economic_analysis",
-                "published_at": (today - datetime.timedelta(hours=2)).isoformat() + 'Z',
-                "timestamp": today.isoformat() + 'Z',
+                "published_at": today - datetime.timedelta(hours=2),
+                "timestamp": self.run_ts,
                 "type": "current"
             },
             {
-                "id": "4",
                 "title": "Oil Revenue Reports for 2025",
                 "url": "https://www.thecable.ng/oil-revenue-2025/",
                 "summary": "NNPC releases latest oil revenue figures for the current year.",
                 "source": "The Cable",
                 "category": "politics_economy",
-                "published_at": (today - datetime.timedelta(hours=3)).isoformat() + 'Z',
-                "timestamp": today.isoformat() + 'Z',
+                "published_at": today - datetime.timedelta(hours=3),
+                "timestamp": self.run_ts,
                 "type": "current"
             },
             {
-                "id": "5",
                 "title": "Inflation Trends in Nigeria 2025",
                 "url": "https://www.premiumtimesng.com/inflation-2025/",
                 "summary": "Latest inflation data and analysis from Nigerian statistical agencies.",
                 "source": "Premium Times",
                 "category": "general",
-                "published_at": (today - datetime.timedelta(hours=4)).isoformat() + 'Z',
-                "timestamp": today.isoformat() + 'Z',
+                "published_at": today - datetime.timedelta(hours=4),
+                "timestamp": self.run_ts,
                 "type": "current"
             }
         ]
         
+        # Same hashed IDs as fetched articles, so they stay stable across runs
+        for article in articles:
+            article['id'] = self.utils.article_id("current", article['title'])
+        
         return articles
     
     def remove_duplicates(self, articles):
         """Remove duplicate articles"""
-        unique = []
-        seen = set()
+        # dict keeps insertion order, so the first copy of each title wins
+        unique = {}
         
         for article in articles:
-            title_key = article['title'].lower()[:50]
-            if title_key not in seen:
-                unique.append(article)
-                seen.add(title_key)
+            title_key = _PUNCT_RE.sub('', article['title'].casefold())[:80]
+            unique.setdefault(title_key, article)
         
-        return unique
+        return list(unique.values())
     
-    def ensure_current_dates(self, articles):
-        """Ensure all articles have current year dates"""
-        current_year = datetime.datetime.utcnow().year
-        
+    def add_unique(self, articles_by_url, articles):
+        """Collect articles by URL, keeping the first copy of each link"""
         for article in articles:
-            pub_date = article['published_at']
-            if str(current_year - 1) in pub_date:
-                article['published_at'] = pub_date.replace(str(current_year - 1), str(current_year))
-            elif str(current_year - 2) in pub_date:
-                article['published_at'] = pub_date.replace(str(current_year - 2), str(current_year))
-        
-        return articles
+            # Tweets without a link all share the '#' placeholder
+            key = article['url'] if article['url'] != '#' else article['id']
+            articles_by_url.setdefault(key, article)
     
     def fetch_all(self):
         """Main function to fetch all news"""
-        print("=" * 50)
-        print("🇳🇬 NIGERIAN ECONOMIC NEWS - LIVE")
-        print("=" * 50)
-        print(f"📅 {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
-        print()
+        log.info("=" * 50)
+        log.info("🇳🇬 NIGERIAN ECONOMIC NEWS - LIVE")
+        log.info("=" * 50)
+        log.info(f"📅 {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}")
+        log.info("")
         
-        all_articles = []
+        # Every article fetched in this run shares one fetch timestamp,
+        # which is also the date given to entries without a usable one
+        self.run_started = datetime.datetime.utcnow()
+        self.run_ts = self.run_started.isoformat() + 'Z'
         
-        # 1. RSS feeds
-        for source in self.config.SOURCES:
-            if source['type'] == 'rss':
-                articles = self.fetch_rss_feed(source)
-                all_articles.extend(articles)
-                time.sleep(0.3)
+        # Keyed by URL, so re-shared links are dropped as they arrive
+        articles_by_url = {}
         
-        # 2. Google News
-        google = self.fetch_google_news()
-        all_articles.extend(google)
+        # 1-3. RSS feeds, Google News and Twitter: one task per feed URL
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [
+                executor.submit(self.fetch_rss_feed, source)
+                for source in self.config.SOURCES
+                if source['type'] == 'rss'
+            ]
+            futures += [
+                executor.submit(self.fetch_google_news, url)
+                for url in self.config.GOOGLE_NEWS_FEEDS
+            ]
+            futures += [
+                executor.submit(self.fetch_twitter_feed, topic_name, url)
+                for topic_name, url in self.config.TWITTER_TOPICS
+            ]
+            
+            # Collect in submission order so de-duplication stays deterministic
+            for future in futures:
+                self.add_unique(articles_by_url, future.result())
         
-        # 3. Twitter
-        twitter = self.fetch_twitter_feeds()
-        all_articles.extend(twitter)
+        self.feed_cache.save()
         
         # 4. Web content
-        if len(all_articles) < 8:
+        if len(articles_by_url) < 8:
             web = self.fetch_web_content()
-            all_articles.extend(web)
+            self.add_unique(articles_by_url, web)
         
         # 5. Process articles
-        all_articles = self.remove_duplicates(all_articles)
-        all_articles = self.ensure_current_dates(all_articles)
+        all_articles = self.remove_duplicates(articles_by_url.values())
         
         # 6. Fallback if needed
         if len(all_articles) < 5:
-            print("⚠️ Adding current articles...")
+            log.info("⚠️ Adding current articles...")
             current = self.generate_current_articles()
             all_articles = current + all_articles
         
-        # 7. Sort and limit
-        all_articles.sort(key=lambda x: x.get('published_at', ''), reverse=True)
-        all_articles = all_articles[:40]
+        # 7. Keep the 40 most recent
+        all_articles = heapq.nlargest(40, all_articles, key=lambda x: x['published_at'])
         
-        print()
-        print("=" * 50)
-        print(f"✅ Total: {len(all_articles)} articles")
-        print(f"📅 All dates: 2025")
-        print("=" * 50)
+        log.info("")
+        log.info("=" * 50)
+        log.info(f"✅ Total: {len(all_articles)} articles")
+        log.info("=" * 50)
         
         return all_articles
 
 # ==================== MAIN ====================
+def setup_logging(quiet=False):
+    """Log through a queue so fetcher threads never wait on stdout"""
+    log_queue = queue.SimpleQueue()
+    
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, handler)
+    
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.WARNING if quiet else logging.INFO)
+    
+    listener.start()
+    return listener
+
 def main():
     """Save news data"""
     
@@ -515,15 +880,14 @@ def main():
     
     output = {
         "status": "success",
-        "last_updated": datetime.datetime.utcnow().isoformat() + 'Z',
+        "last_updated": fetcher.run_ts,
         "total_articles": len(articles),
         "year": "2025",
         "articles": articles
     }
     
-    # Save main file
-    with open("api/news.json", "w", encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    # Save main file; it is read by the site and the other scripts, not people
+    Utils.write_json("api/news.json", output, indent=False)
     
     # Save simple version for web
     simple_articles = []
@@ -536,18 +900,24 @@ def main():
             "summary": article["summary"]
         })
     
-    with open("api/news-simple.json", "w") as f:
-        json.dump({"articles": simple_articles}, f, indent=2)
+    Utils.write_json("api/news-simple.json", {"articles": simple_articles})
     
-    print(f"💾 Saved to api/news.json")
-    print(f"📊 Articles: {len(articles)}")
+    log.info(f"💾 Saved to api/news.json")
+    log.info(f"📊 Articles: {len(articles)}")
     
     return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch Nigerian economic news into api/")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only log warnings and errors")
+    args = parser.parse_args()
+    
+    listener = setup_logging(args.quiet)
     try:
         main()
         exit(0)
     except Exception as e:
-        print(f"❌ Error: {e}")
+        log.error(f"❌ Error: {e}")
         exit(1)
+    finally:
+        listener.stop()
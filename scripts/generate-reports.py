@@ -3,10 +3,37 @@
 Generate human-readable reports from processed data
 """
 
-import json
 import datetime
+import bisect
+import math
 from pathlib import Path
-import statistics
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+
+# Buffer size for report files, large enough to hold a whole report
+WRITE_BUFFER = 1 << 20
+
+# Sentiment labels by score band: below -0.2, -0.2 to 0.2 inclusive, above 0.2.
+# The lower bound is the float just under -0.2 so that -0.2 itself is neutral.
+SENTIMENT_BOUNDS = (math.nextafter(-0.2, -math.inf), 0.2)
+SENTIMENT_LABELS = ("😟 Negative", "😐 Neutral", "😊 Positive")
+
+def utc_date_prefix(value):
+    """UTC 'YYYY-MM-DD' of an ISO 8601 timestamp, or '' if there is none"""
+    if not isinstance(value, str):
+        return ""
+    # Current runs write UTC with a bare 'Z', so the date is the first ten
+    # characters; older runs wrote offsets such as '+01:00Z' that can move it
+    tail = value[19:]
+    if "+" not in tail and "-" not in tail:
+        return value[:10]
+    try:
+        dt = datetime.datetime.fromisoformat(value.rstrip("Z"))
+    except ValueError:
+        return ""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc)
+    return dt.date().isoformat()
 
 class ReportGenerator:
     def __init__(self):
@@ -16,20 +43,21 @@ class ReportGenerator:
     
     def generate_weekly_report(self):
         """Generate a weekly summary report"""
+        print("📋 Generating weekly report...")
         try:
-            with open(self.data_dir / "analytics.json", "r") as f:
-                analytics = json.load(f)
+            with open(self.data_dir / "analytics.json", "rb") as f:
+                analytics = orjson.loads(f.read())
             
-            with open(self.data_dir / "trending.json", "r") as f:
-                trends = json.load(f)
+            with open(self.data_dir / "trending.json", "rb") as f:
+                trends = orjson.loads(f.read())
             
-            with open(self.data_dir / "sources-stats.json", "r") as f:
-                sources = json.load(f)
+            with open(self.data_dir / "sources-stats.json", "rb") as f:
+                sources = orjson.loads(f.read())
             
             # Generate markdown report
             report_date = datetime.datetime.utcnow().strftime("%Y-%m-%d")
             
-            report = f"""# 📊 Nigeria Economic News Weekly Report
+            parts = [f"""# 📊 Nigeria Economic News Weekly Report
 **Report Period**: {report_date}
 
 ## 📈 Executive Summary
@@ -40,23 +68,23 @@ class ReportGenerator:
 
 ## 🔥 Trending Topics This Week
 
-"""
+"""]
             
             # Add trending topics
             trending = trends.get('trends', {}).get('trending_keywords', [])[:5]
             for i, topic in enumerate(trending, 1):
-                report += f"{i}. **{topic['keyword'].title()}** - Mentioned {topic['count']} times (Score: {topic['score']:.2f})\n"
+                parts.append(f"{i}. **{topic['keyword'].title()}** - Mentioned {topic['count']} times (Score: {topic['score']:.2f})\n")
             
-            report += "\n## 🏛️ Government Entities in Focus\n\n"
+            parts.append("\n## 🏛️ Government Entities in Focus\n\n")
             
             # Add trending entities
             entities = trends.get('trends', {}).get('trending_entities', [])[:5]
             for i, entity in enumerate(entities, 1):
-                report += f"{i}. **{entity['entity']}** - Mentioned {entity['count']} times\n"
+                parts.append(f"{i}. **{entity['entity']}** - Mentioned {entity['count']} times\n")
             
-            report += "\n## 📰 Source Performance\n\n"
-            report += "| Source | Articles | Dominant Category | Avg Sentiment |\n"
-            report += "|--------|----------|-------------------|---------------|\n"
+            parts.append("\n## 📰 Source Performance\n\n")
+            parts.append("| Source | Articles | Dominant Category | Avg Sentiment |\n")
+            parts.append("|--------|----------|-------------------|---------------|\n")
             
             # Add source statistics
             sources_data = sources.get('sources', {})
@@ -66,40 +94,42 @@ class ReportGenerator:
                 sentiment = data.get('avg_sentiment', 0)
                 sentiment_label = self.get_sentiment_label(sentiment)
                 
-                report += f"| {source} | {articles} | {category} | {sentiment_label} |\n"
+                parts.append(f"| {source} | {articles} | {category} | {sentiment_label} |\n")
             
-            report += f"\n## 📅 Peak News Hours\n\n"
+            parts.append(f"\n## 📅 Peak News Hours\n\n")
             
             # Add peak hours
             peak_hours = analytics.get('analytics', {}).get('peak_hours', [])
             for hour_data in peak_hours:
                 hour = hour_data.get('hour', 0)
                 count = hour_data.get('count', 0)
-                report += f"- **{hour:02d}:00**: {count} articles published\n"
+                parts.append(f"- **{hour:02d}:00**: {count} articles published\n")
             
-            report += f"\n## 💡 Insights\n\n"
+            parts.append(f"\n## 💡 Insights\n\n")
             
             # Generate insights
             total_articles = analytics.get('analytics', {}).get('total_articles', 0)
             if total_articles > 50:
-                report += "- High volume of economic news indicates active market discussions\n"
+                parts.append("- High volume of economic news indicates active market discussions\n")
             
             avg_sentiment = analytics.get('analytics', {}).get('avg_sentiment', 0)
             if avg_sentiment > 0.1:
-                report += "- Overall positive sentiment suggests optimistic economic outlook\n"
+                parts.append("- Overall positive sentiment suggests optimistic economic outlook\n")
             elif avg_sentiment < -0.1:
-                report += "- Negative sentiment indicates economic concerns among analysts\n"
+                parts.append("- Negative sentiment indicates economic concerns among analysts\n")
             
             # Most mentioned economic indicator
             if trending:
                 top_topic = trending[0]['keyword']
-                report += f"- **{top_topic.title()}** is the most discussed economic indicator\n"
+                parts.append(f"- **{top_topic.title()}** is the most discussed economic indicator\n")
+            
+            parts.append(f"\n---\n*Report generated automatically on {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}*\n")
             
-            report += f"\n---\n*Report generated automatically on {datetime.datetime.utcnow().strftime('%Y-%m-%d %H:%M UTC')}*\n"
+            report = "".join(parts)
             
             # Save report
             report_path = self.reports_dir / f"weekly-report-{report_date}.md"
-            with open(report_path, "w") as f:
+            with open(report_path, "w", buffering=WRITE_BUFFER) as f:
                 f.write(report)
             
             print(f"✅ Weekly report saved: {report_path}")
@@ -114,8 +144,8 @@ class ReportGenerator:
                 "insights": self.generate_insights(analytics, trends, sources)
             }
             
-            with open(self.reports_dir / "weekly-report.json", "w") as f:
-                json.dump(json_report, f, indent=2)
+            with open(self.reports_dir / "weekly-report.json", "wb", buffering=WRITE_BUFFER) as f:
+                f.write(orjson.dumps(json_report, option=orjson.OPT_INDENT_2))
             
             print("✅ JSON report saved")
             
@@ -124,12 +154,7 @@ class ReportGenerator:
     
     def get_sentiment_label(self, score):
         """Convert sentiment score to label"""
-        if score > 0.2:
-            return "😊 Positive"
-        elif score < -0.2:
-            return "😟 Negative"
-        else:
-            return "😐 Neutral"
+        return SENTIMENT_LABELS[bisect.bisect_left(SENTIMENT_BOUNDS, score)]
     
     def generate_insights(self, analytics, trends, sources):
         """Generate automated insights from data"""
@@ -173,60 +198,59 @@ class ReportGenerator:
     
     def generate_daily_digest(self):
         """Generate a short daily digest"""
+        print("📰 Generating daily digest...")
         try:
-            with open(Path("api") / "news.json", "r") as f:
-                news_data = json.load(f)
+            with open(Path("api") / "news.json", "rb") as f:
+                news_data = orjson.loads(f.read())
             
             today = datetime.datetime.utcnow().date()
-            today_articles = []
             
+            # Compare dates as 'YYYY-MM-DD' strings rather than parsing each one
+            today_prefix = today.isoformat()
+            
+            # Group today's articles by source in one pass, keeping only
+            # the first three per source since that is all the digest shows
+            today_count = 0
+            by_source = {}
             for article in news_data.get("articles", []):
-                pub_date = article.get("published_at", "")
-                if pub_date:
-                    try:
-                        article_date = datetime.datetime.fromisoformat(pub_date).date()
-                        if article_date == today:
-                            today_articles.append(article)
-                    except:
-                        continue
-            
-            if not today_articles:
+                if utc_date_prefix(article.get("published_at")) != today_prefix:
+                    continue
+                today_count += 1
+                top_stories = by_source.setdefault(article.get("source", "Unknown"), [])
+                if len(top_stories) < 3:
+                    top_stories.append(article)
+            
+            if not today_count:
                 print("⚠️ No articles from today found")
                 return
             
             # Generate digest
             digest_date = today.strftime("%Y-%m-%d")
-            digest = f"""# 📰 Nigeria Economic News Daily Digest
+            parts = [f"""# 📰 Nigeria Economic News Daily Digest
 **Date**: {digest_date}
-**Total Articles Today**: {len(today_articles)}
+**Total Articles Today**: {today_count}
 
 ## Top Stories Today
 
-"""
-            
-            # Group by source
-            by_source = {}
-            for article in today_articles:
-                source = article.get("source", "Unknown")
-                if source not in by_source:
-                    by_source[source] = []
-                by_source[source].append(article)
+"""]
             
             for source, articles in by_source.items():
-                digest += f"\n### 🏛️ {source}\n\n"
-                for i, article in enumerate(articles[:3], 1):
+                parts.append(f"\n### 🏛️ {source}\n\n")
+                for i, article in enumerate(articles, 1):
                     title = article.get("title", "No title")
                     summary = article.get("summary", "")[:100] + "..." if len(article.get("summary", "")) > 100 else article.get("summary", "")
-                    digest += f"{i}. **{title}**\n"
+                    parts.append(f"{i}. **{title}**\n")
                     if summary:
-                        digest += f"   *{summary}*\n"
-                    digest += "\n"
+                        parts.append(f"   *{summary}*\n")
+                    parts.append("\n")
+            
+            parts.append(f"\n---\n*Automatically generated on {datetime.datetime.utcnow().strftime('%H:%M UTC')}*\n")
             
-            digest += f"\n---\n*Automatically generated on {datetime.datetime.utcnow().strftime('%H:%M UTC')}*\n"
+            digest = "".join(parts)
             
             # Save digest
             digest_path = self.reports_dir / f"daily-digest-{digest_date}.md"
-            with open(digest_path, "w") as f:
+            with open(digest_path, "w", buffering=WRITE_BUFFER) as f:
                 f.write(digest)
             
             print(f"✅ Daily digest saved: {digest_path}")
@@ -236,7 +260,7 @@ class ReportGenerator:
 
 if __name__ == "__main__":
     generator = ReportGenerator()
-    print("📋 Generating weekly report...")
-    generator.generate_weekly_report()
-    print("📰 Generating daily digest...")
-    generator.generate_daily_digest()
+    # The two reports read and write different files, so build them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        executor.submit(generator.generate_weekly_report)
+        executor.submit(generator.generate_daily_digest)
@@ -7,12 +7,59 @@ Advanced data processor for Nigerian economic news
 - Analytics generation
 """
 
-import json
 import datetime
 from collections import Counter, defaultdict
 import re
+import math
+import heapq
+import functools
 from pathlib import Path
-import statistics
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+
+# Output files are written in one go; a large buffer keeps that to one syscall
+WRITE_BUFFER = 1 << 20
+
+# Sentiment indicators; only how many of each appear matters, not their order
+POSITIVE_WORDS = frozenset([
+    'growth', 'increase', 'rise', 'gain', 'profit', 'surplus',
+    'recovery', 'improve', 'strong', 'bullish', 'optimistic',
+    'positive', 'outperform', 'beat', 'exceed', 'record',
+    'achievement', 'success', 'boom', 'expansion'
+])
+
+NEGATIVE_WORDS = frozenset([
+    'decline', 'fall', 'drop', 'loss', 'deficit', 'recession',
+    'worsen', 'weak', 'bearish', 'pessimistic', 'negative',
+    'underperform', 'miss', 'below', 'crisis', 'slump',
+    'inflation', 'debt', 'default', 'corruption'
+])
+
+# Leading YYYY-MM-DD of an ISO 8601 timestamp
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+def parse_timestamp(value):
+    """Naive UTC datetime from an ISO 8601 string, or None if it can't be parsed"""
+    # Screen out obvious non-dates without raising and catching an exception;
+    # this runs before the cache, which cannot hash lists or dicts
+    if not isinstance(value, str) or not _ISO_DATE_RE.match(value):
+        return None
+    return _parse_iso_timestamp(value)
+
+# Articles from one feed often share a timestamp
+@functools.lru_cache(maxsize=4096)
+def _parse_iso_timestamp(value):
+    """parse_timestamp for strings that look like ISO dates"""
+    # fromisoformat only accepts a trailing 'Z' from Python 3.11. Dropping it
+    # leaves a naive UTC time, or the explicit offset older runs wrote
+    # before it ('+01:00Z')
+    try:
+        dt = datetime.datetime.fromisoformat(value.rstrip('Z'))
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return dt
 
 class NigeriaNewsProcessor:
     def __init__(self):
@@ -45,45 +92,66 @@ class NigeriaNewsProcessor:
             "Finance Ministry", "Budget Office", "FIRS", "Customs"
         ]
         
+        # Every term we look for, each tagged with what it counts towards.
+        # Terms shared between lists (e.g. "inflation") are scanned once.
+        # Keywords go in first so matches come back in economic_indicators order.
+        term_tags = {}
+        for kind, names in (
+            ("keyword", self.economic_indicators),
+            ("entity", self.government_entities),
+            ("positive", POSITIVE_WORDS),
+            ("negative", NEGATIVE_WORDS),
+        ):
+            for name in names:
+                term_tags.setdefault(name.lower(), []).append((kind, name))
+        self.term_table = list(term_tags.items())
+        
+        # Economic figures to extract, compiled once for all articles
+        self.economic_patterns = {
+            key: re.compile(pattern, re.IGNORECASE)
+            for key, pattern in {
+                "inflation_rate": r'inflation.*?(\d+\.?\d*)\s*%',
+                "policy_rate": r'MPR.*?(\d+\.?\d*)\s*%|policy rate.*?(\d+\.?\d*)\s*%',
+                "exchange_rate": r'(\d+\.?\d*)\s*(?:naira|NGN)\s*(?:per|to)\s*(?:dollar|USD)',
+                "gdp_growth": r'GDP.*?growth.*?(\d+\.?\d*)\s*%',
+                "budget_amount": r'budget.*?₦\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:trillion|billion|million)?',
+                "oil_price": r'oil.*?\$(\d+\.?\d*)|crude.*?\$(\d+\.?\d*)',
+                "unemployment_rate": r'unemployment.*?(\d+\.?\d*)\s*%',
+                "debt_amount": r'debt.*?(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:trillion|billion|million)',
+            }.items()
+        }
+        
     def load_articles(self):
         """Load raw articles from news.json"""
         try:
-            with open(self.data_dir / "news.json", "r") as f:
-                data = json.load(f)
+            with open(self.data_dir / "news.json", "rb") as f:
+                data = orjson.loads(f.read())
             return data.get("articles", [])
         except FileNotFoundError:
             print("❌ news.json not found")
             return []
     
-    def analyze_sentiment(self, text):
+    def match_terms(self, text_lower):
+        """Tracked terms found in lowercased text, grouped by kind"""
+        found = defaultdict(list)
+        for term, tags in self.term_table:
+            if term in text_lower:
+                for kind, name in tags:
+                    found[kind].append(name)
+        return found
+    
+    def analyze_sentiment(self, text, found=None):
         """Simple sentiment analysis without external APIs"""
-        text_lower = text.lower()
-        
-        # Positive indicators
-        positive_words = [
-            'growth', 'increase', 'rise', 'gain', 'profit', 'surplus',
-            'recovery', 'improve', 'strong', 'bullish', 'optimistic',
-            'positive', 'outperform', 'beat', 'exceed', 'record',
-            'achievement', 'success', 'boom', 'expansion'
-        ]
+        if found is None:
+            found = self.match_terms(text.lower())
         
-        # Negative indicators
-        negative_words = [
-            'decline', 'fall', 'drop', 'loss', 'deficit', 'recession',
-            'worsen', 'weak', 'bearish', 'pessimistic', 'negative',
-            'underperform', 'miss', 'below', 'crisis', 'slump',
-            'inflation', 'debt', 'default', 'corruption'
-        ]
-        
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        positive_count = len(found["positive"])
+        negative_count = len(found["negative"])
         
         # Calculate sentiment score (-1 to 1)
+        # Text without any sentiment words scores as neutral
         total = positive_count + negative_count
-        if total == 0:
-            return 0
-        
-        sentiment = (positive_count - negative_count) / total
+        sentiment = (positive_count - negative_count) / total if total else 0.0
         
         # Categorize
         if sentiment > 0.2:
@@ -95,58 +163,41 @@ class NigeriaNewsProcessor:
     
     def extract_economic_data(self, text):
         """Extract economic indicators and numbers from text"""
-        patterns = {
-            "inflation_rate": r'inflation.*?(\d+\.?\d*)\s*%',
-            "policy_rate": r'MPR.*?(\d+\.?\d*)\s*%|policy rate.*?(\d+\.?\d*)\s*%',
-            "exchange_rate": r'(\d+\.?\d*)\s*(?:naira|NGN)\s*(?:per|to)\s*(?:dollar|USD)',
-            "gdp_growth": r'GDP.*?growth.*?(\d+\.?\d*)\s*%',
-            "budget_amount": r'budget.*?₦\s*(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:trillion|billion|million)?',
-            "oil_price": r'oil.*?\$(\d+\.?\d*)|crude.*?\$(\d+\.?\d*)',
-            "unemployment_rate": r'unemployment.*?(\d+\.?\d*)\s*%',
-            "debt_amount": r'debt.*?(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:trillion|billion|million)',
-        }
-        
         extracted = {}
-        for key, pattern in patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                # Flatten tuple matches and get first non-empty
-                flat_matches = [m for match in matches for m in match if m]
-                if flat_matches:
-                    try:
-                        # Clean number (remove commas)
-                        clean_num = flat_matches[0].replace(',', '')
-                        extracted[key] = float(clean_num)
-                    except:
-                        extracted[key] = flat_matches[0]
+        for key, pattern in self.economic_patterns.items():
+            # Only the first figure is kept, so stop at the first match
+            match = pattern.search(text)
+            if match:
+                # Alternations leave the groups of the other branch empty
+                value = next(group for group in match.groups() if group)
+                try:
+                    # Clean number (remove commas)
+                    extracted[key] = float(value.replace(',', ''))
+                except ValueError:
+                    extracted[key] = value
         
         return extracted
     
-    def detect_trends(self, articles):
+    def detect_trends(self, articles, processed_articles):
         """Detect trending topics and entities"""
         # Collect keywords from recent articles (last 24 hours)
         now = datetime.datetime.utcnow()
+        cutoff = now - datetime.timedelta(days=1)
         recent_articles = [
-            a for a in articles 
-            if (now - datetime.datetime.fromisoformat(a.get('published_at', now.isoformat()))).days < 1
+            enhanced for article, enhanced in zip(articles, processed_articles)
+            if article['_ts'] is not None and article['_ts'] > cutoff
         ]
         
         # Analyze word frequencies
         word_counts = Counter()
         entity_counts = Counter()
         
-        for article in recent_articles:
-            text = f"{article.get('title', '')} {article.get('summary', '')}".lower()
-            
+        for enhanced in recent_articles:
             # Count economic keywords
-            for keyword in self.economic_indicators:
-                if keyword in text:
-                    word_counts[keyword] += 1
+            word_counts.update(enhanced["matched_keywords"])
             
             # Count government entities
-            for entity in self.government_entities:
-                if entity.lower() in text:
-                    entity_counts[entity] += 1
+            entity_counts.update(enhanced["matched_entities"])
         
         # Calculate trend scores (normalize by total articles)
         total_recent = len(recent_articles)
@@ -176,26 +227,30 @@ class NigeriaNewsProcessor:
             "analysis_time": now.isoformat()
         }
     
-    def generate_analytics(self, articles):
+    def generate_analytics(self, articles, processed_articles):
         """Generate comprehensive analytics"""
         if not articles:
             return {}
         
         # Time-based analysis
-        articles_by_hour = defaultdict(int)
+        articles_by_hour = [0] * 24
         articles_by_source = Counter()
         articles_by_category = Counter()
         
         sentiment_scores = []
+        sentiment_labels = Counter()
         article_lengths = []
+        published_times = []
         
-        for article in articles:
+        for article, enhanced in zip(articles, processed_articles):
+            ts = article['_ts']
+            published_at = article.get('published_at')
+            
             # Publication hour distribution
-            try:
-                pub_time = datetime.datetime.fromisoformat(article.get('published_at', ''))
-                articles_by_hour[pub_time.hour] += 1
-            except:
-                pass
+            if ts is not None:
+                articles_by_hour[ts.hour] += 1
+            if published_at:
+                published_times.append(published_at)
             
             # Source distribution
             articles_by_source[article.get('source', 'Unknown')] += 1
@@ -203,26 +258,30 @@ class NigeriaNewsProcessor:
             # Category distribution
             articles_by_category[article.get('category', 'general')] += 1
             
-            # Sentiment analysis
-            text = f"{article.get('title', '')} {article.get('summary', '')}"
-            sentiment = self.analyze_sentiment(text)
+            # Sentiment analysis, as already done by process_all
+            sentiment = enhanced["sentiment_analysis"]
             sentiment_scores.append(sentiment["score"])
+            sentiment_labels[sentiment["label"]] += 1
             
-            # Article length
-            article_lengths.append(len(text))
+            # Article length, of the same "title summary" text that was analysed
+            article_lengths.append(len(article.get('title', '')) + 1 + len(article.get('summary', '')))
         
         # Calculate statistics
-        avg_sentiment = statistics.mean(sentiment_scores) if sentiment_scores else 0
-        avg_length = statistics.mean(article_lengths) if article_lengths else 0
+        avg_sentiment = math.fsum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 0
+        avg_length = sum(article_lengths) / len(article_lengths) if article_lengths else 0
         
         # Most productive hours
-        top_hours = sorted(articles_by_hour.items(), key=lambda x: x[1], reverse=True)[:3]
+        top_hours = heapq.nlargest(
+            3,
+            ((hour, count) for hour, count in enumerate(articles_by_hour) if count),
+            key=lambda x: x[1]
+        )
         
-        # Sentiment distribution
+        # Sentiment distribution; labels use the same +/-0.2 cut-offs
         sentiment_dist = {
-            "positive": len([s for s in sentiment_scores if s > 0.2]),
-            "neutral": len([s for s in sentiment_scores if -0.2 <= s <= 0.2]),
-            "negative": len([s for s in sentiment_scores if s < -0.2])
+            "positive": sentiment_labels["positive"],
+            "neutral": sentiment_labels["neutral"],
+            "negative": sentiment_labels["negative"]
         }
         
         return {
@@ -236,84 +295,86 @@ class NigeriaNewsProcessor:
             "sources_count": len(articles_by_source),
             "categories_count": len(articles_by_category),
             "analysis_period": {
-                "start": min([a.get('published_at') for a in articles if a.get('published_at')], default=""),
-                "end": max([a.get('published_at') for a in articles if a.get('published_at')], default="")
+                "start": min(published_times, default=""),
+                "end": max(published_times, default="")
             }
         }
     
-    def process_sources_stats(self, articles):
+    def process_sources_stats(self, articles, processed_articles):
         """Generate statistics for each news source"""
         sources_data = {}
         
-        for article in articles:
+        for article, enhanced in zip(articles, processed_articles):
             source = article.get('source', 'Unknown')
-            if source not in sources_data:
-                sources_data[source] = {
+            source_data = sources_data.get(source)
+            if source_data is None:
+                source_data = sources_data[source] = {
                     "count": 0,
                     "categories": Counter(),
                     "sentiments": [],
                     "avg_length": [],
-                    "latest_article": ""
+                    "latest_article": "",
+                    "latest_ts": None
                 }
             
-            source_data = sources_data[source]
             source_data["count"] += 1
             
             # Track categories
             source_data["categories"][article.get('category', 'general')] += 1
             
             # Track sentiment
-            text = f"{article.get('title', '')} {article.get('summary', '')}"
-            sentiment = self.analyze_sentiment(text)
-            source_data["sentiments"].append(sentiment["score"])
+            source_data["sentiments"].append(enhanced["sentiment_analysis"]["score"])
             
             # Track article length
-            source_data["avg_length"].append(len(text))
+            source_data["avg_length"].append(len(article.get('title', '')) + 1 + len(article.get('summary', '')))
             
-            # Track latest article
-            article_time = article.get('published_at', '')
-            if article_time > source_data["latest_article"]:
-                source_data["latest_article"] = article_time
+            # Track latest article, comparing parsed times since ISO strings
+            # with different offsets or precision don't sort chronologically
+            ts = article['_ts']
+            if ts is not None and (source_data["latest_ts"] is None or ts > source_data["latest_ts"]):
+                source_data["latest_ts"] = ts
+                source_data["latest_article"] = article.get('published_at', '')
         
         # Calculate averages and format
+        now = datetime.datetime.utcnow()
         formatted_sources = {}
         for source, data in sources_data.items():
-            avg_sentiment = statistics.mean(data["sentiments"]) if data["sentiments"] else 0
-            avg_length = statistics.mean(data["avg_length"]) if data["avg_length"] else 0
+            avg_sentiment = math.fsum(data["sentiments"]) / len(data["sentiments"]) if data["sentiments"] else 0
+            avg_length = sum(data["avg_length"]) / len(data["avg_length"]) if data["avg_length"] else 0
             
             formatted_sources[source] = {
                 "article_count": data["count"],
-                "dominant_category": data["categories"].most_common(1)[0][0] if data["categories"] else "general",
+                "dominant_category": max(data["categories"], key=data["categories"].get) if data["categories"] else "general",
                 "category_distribution": dict(data["categories"]),
                 "avg_sentiment": avg_sentiment,
                 "sentiment_label": "positive" if avg_sentiment > 0.2 else "negative" if avg_sentiment < -0.2 else "neutral",
                 "avg_article_length": avg_length,
                 "latest_article": data["latest_article"],
-                "update_frequency": self.calculate_update_frequency(data["latest_article"], data["count"])
+                "update_frequency": self.calculate_update_frequency(data["latest_ts"], data["count"], now)
             }
         
         return formatted_sources
     
-    def calculate_update_frequency(self, latest_article, article_count):
+    def calculate_update_frequency(self, latest_ts, article_count, now):
         """Calculate how frequently a source updates"""
-        if not latest_article or article_count < 2:
+        if latest_ts is None or article_count < 2:
             return "unknown"
         
-        try:
-            latest = datetime.datetime.fromisoformat(latest_article)
-            now = datetime.datetime.utcnow()
-            hours_since_last = (now - latest).total_seconds() / 3600
-            
-            if hours_since_last < 2:
-                return "very_frequent"
-            elif hours_since_last < 6:
-                return "frequent"
-            elif hours_since_last < 24:
-                return "daily"
-            else:
-                return "infrequent"
-        except:
-            return "unknown"
+        hours_since_last = (now - latest_ts).total_seconds() / 3600
+        
+        if hours_since_last < 2:
+            return "very_frequent"
+        elif hours_since_last < 6:
+            return "frequent"
+        elif hours_since_last < 24:
+            return "daily"
+        else:
+            return "infrequent"
+    
+    def preparse_times(self, articles):
+        """Parse each article's published_at once, into article['_ts']"""
+        for article in articles:
+            article['_ts'] = parse_timestamp(article.get('published_at'))
     
     def process_all(self):
         """Main processing pipeline"""
@@ -332,26 +393,23 @@ class NigeriaNewsProcessor:
         for article in articles:
             text = f"{article.get('title', '')} {article.get('summary', '')}"
             
+            # One scan for sentiment words, keywords and entities together
+            found = self.match_terms(text.lower())
+            
             enhanced = article.copy()
             
             # Add sentiment analysis
-            enhanced["sentiment_analysis"] = self.analyze_sentiment(text)
+            enhanced["sentiment_analysis"] = self.analyze_sentiment(text, found)
             
             # Extract economic data
             enhanced["extracted_data"] = self.extract_economic_data(text)
             
             # Add keyword matches
-            matched_keywords = []
-            for keyword in self.economic_indicators:
-                if keyword.lower() in text.lower():
-                    matched_keywords.append(keyword)
+            matched_keywords = found["keyword"]
             enhanced["matched_keywords"] = matched_keywords
             
             # Add entity matches
-            matched_entities = []
-            for entity in self.government_entities:
-                if entity.lower() in text.lower():
-                    matched_entities.append(entity)
+            matched_entities = found["entity"]
             enhanced["matched_entities"] = matched_entities
             
             # Calculate relevance score
@@ -360,17 +418,20 @@ class NigeriaNewsProcessor:
             
             processed_articles.append(enhanced)
         
+        # Parsed after the enhanced copies are made, so _ts is not saved with them
+        self.preparse_times(articles)
+        
         # Generate analytics
         print("📊 Generating analytics...")
-        analytics = self.generate_analytics(articles)
+        analytics = self.generate_analytics(articles, processed_articles)
         
         # Detect trends
         print("📈 Detecting trends...")
-        trends = self.detect_trends(articles)
+        trends = self.detect_trends(articles, processed_articles)
         
         # Process source statistics
         print("🏛️ Analyzing sources...")
-        sources_stats = self.process_sources_stats(articles)
+        sources_stats = self.process_sources_stats(articles, processed_articles)
         
         # Save processed data
         self.save_processed_data(
@@ -382,50 +443,61 @@ class NigeriaNewsProcessor:
         
         print("✅ Data processing complete!")
     
+    def write_output(self, name, body):
+        """Write one serialised artifact into the processed directory"""
+        with open(self.processed_dir / name, "wb", buffering=WRITE_BUFFER) as f:
+            f.write(body)
+    
     def save_processed_data(self, processed_articles, analytics, trends, sources_stats):
         """Save all processed data to files"""
+        generated_at = datetime.datetime.utcnow().isoformat()
         
-        # Save enhanced articles
-        with open(self.processed_dir / "articles-enhanced.json", "w") as f:
-            json.dump({
-                "processed_at": datetime.datetime.utcnow().isoformat(),
+        outputs = {
+            # Enhanced articles
+            "articles-enhanced.json": {
+                "processed_at": generated_at,
                 "articles": processed_articles
-            }, f, indent=2, default=str)
-        
-        # Save analytics
-        with open(self.processed_dir / "analytics.json", "w") as f:
-            json.dump({
-                "generated_at": datetime.datetime.utcnow().isoformat(),
+            },
+            # Analytics
+            "analytics.json": {
+                "generated_at": generated_at,
                 "analytics": analytics
-            }, f, indent=2, default=str)
-        
-        # Save trends
-        with open(self.processed_dir / "trending.json", "w") as f:
-            json.dump({
-                "generated_at": datetime.datetime.utcnow().isoformat(),
+            },
+            # Trends
+            "trending.json": {
+                "generated_at": generated_at,
                 "trends": trends
-            }, f, indent=2, default=str)
-        
-        # Save source statistics
-        with open(self.processed_dir / "sources-stats.json", "w") as f:
-            json.dump({
-                "generated_at": datetime.datetime.utcnow().isoformat(),
+            },
+            # Source statistics
+            "sources-stats.json": {
+                "generated_at": generated_at,
                 "sources": sources_stats
-            }, f, indent=2, default=str)
-        
-        # Create a summary file
-        summary = {
-            "processing_completed": datetime.datetime.utcnow().isoformat(),
-            "total_articles_processed": len(processed_articles),
-            "analytics_summary": {
-                "avg_sentiment": analytics.get("avg_sentiment", 0),
-                "top_sources": analytics.get("top_sources", []),
-                "trending_keywords": trends.get("trending_keywords", [])[:3]
-            }
+            },
+            # Summary file
+            "summary.json": {
+                "processing_completed": generated_at,
+                "total_articles_processed": len(processed_articles),
+                "analytics_summary": {
+                    "avg_sentiment": analytics.get("avg_sentiment", 0),
+                    "top_sources": analytics.get("top_sources", []),
+                    "trending_keywords": trends.get("trending_keywords", [])[:3]
+                }
+            },
         }
         
-        with open(self.processed_dir / "summary.json", "w") as f:
-            json.dump(summary, f, indent=2, default=str)
+        # Serialise everything first, then write the files side by side;
+        # the writes release the GIL. Only the summary is meant to be read
+        # by people; the rest is compact since scripts and the site read it.
+        bodies = {
+            name: orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2 if name == "summary.json" else 0,
+                default=str
+            )
+            for name, data in outputs.items()
+        }
+        with ThreadPoolExecutor(max_workers=len(bodies)) as executor:
+            list(executor.map(self.write_output, bodies.keys(), bodies.values()))
 
 if __name__ == "__main__":
     processor = NigeriaNewsProcessor()